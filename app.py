@@ -1,24 +1,95 @@
 import os
+import socket
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from functools import wraps
+from urllib.parse import quote, urlsplit, urlunsplit, parse_qsl, urlencode
 from flask import (
-    Flask, render_template, request, session,
-    flash, redirect, url_for, jsonify, abort
+    Flask, Request, Response, render_template, request, session,
+    flash, redirect, url_for, jsonify, abort, g, make_response,
+    stream_with_context, before_render_template
 )
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import func, text
-from sqlalchemy.exc import OperationalError
-from werkzeug.security import generate_password_hash, check_password_hash
-from werkzeug.utils import secure_filename
+from flask_caching import Cache
+from flask_compress import Compress
+from flask_session import Session
+from flask_limiter import Limiter
+from flask_limiter.util import get_remote_address
+import redis
+from sqlalchemy import bindparam, event, func, text, literal_column
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError, OperationalError, TimeoutError as PoolTimeoutError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session as OrmSession, load_only, raiseload
+from werkzeug.exceptions import HTTPException
+from werkzeug.middleware.proxy_fix import ProxyFix
+from werkzeug.security import check_password_hash
+from werkzeug.utils import cached_property, secure_filename
 import cloudinary
 import cloudinary.uploader
-from dotenv import load_dotenv
+import orjson
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
 
 # ================== LOAD ENV ==================
-load_dotenv()
+# Local development only; in production the environment is already exported
+# and there's no .env to search for. Looked up next to this file, so scripts
+# run from another directory still find it.
+ENV_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env")
+if os.path.exists(ENV_FILE):
+    from dotenv import load_dotenv
+    load_dotenv(ENV_FILE)
 
 # ================== APP SETUP ==================
+class ORJSONProvider(DefaultJSONProvider):
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+# Uploaded files are spooled straight into named temp files, which
+# save_upload() hands to the background publisher as they are, instead of
+# copying Werkzeug's anonymous spool file a second time.
+class SpoolingRequest(Request):
+    @cached_property
+    def spooled_files(self):
+        return []
+
+    def _get_file_stream(self, total_content_length, content_type,
+                         filename=None, content_length=None):
+        suffix = os.path.splitext(secure_filename(filename or ""))[1]
+        stream = tempfile.NamedTemporaryFile("wb+", suffix=suffix, delete=False)
+        self.spooled_files.append(stream.name)
+        return stream
+
 app = Flask(__name__, template_folder="templates", static_folder="static")
+app.request_class = SpoolingRequest
+app.json = ORJSONProvider(app)
+app.config.update(
+    COMPRESS_MIMETYPES=[
+        "text/html", "text/css", "application/json", "application/javascript"
+    ],
+    # Brotli first (smaller than zstd on these pages), gzip for the rest
+    COMPRESS_ALGORITHM=["br", "gzip"],
+    # quality 5 takes ~7% off the home page over the default 4 for ~0.1ms;
+    # pages stay well under the 256KB window, which keeps the encoder small
+    COMPRESS_BR_LEVEL=5,
+    COMPRESS_BR_WINDOW=18,
+    # compression appends ":br"/":gzip" to the view's ETag, so the 304 check
+    # has to happen after it for compressed responses to revalidate
+    COMPRESS_EVALUATE_CONDITIONAL_REQUEST=True,
+)
+Compress(app)
 app.secret_key = os.getenv("SECRET_KEY", "change-this")
+app.config["MAX_CONTENT_LENGTH"] = int(os.getenv("MAX_UPLOAD_MB", "100")) * 1024 * 1024
+# static/ only holds bundled book files, which never change in place; browsers
+# may keep them for a week and revalidate by ETag after that
+app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 7 * 24 * 3600
 
 # ================== ADMIN CONFIG ==================
 ADMIN_EMAIL = os.getenv("ADMIN_EMAIL")
@@ -29,21 +100,127 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise RuntimeError("❌ DATABASE_URL not set")
 
-if DATABASE_URL.startswith("postgres://"):
-    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
-
-if "sslmode" not in DATABASE_URL:
-    DATABASE_URL += "?sslmode=require"
+# Heroku-style postgres:// URLs -> psycopg 3 driver, sslmode=require unless
+# the URL already sets one.
+db_url = urlsplit(DATABASE_URL)
+if db_url.scheme.startswith("postgres"):
+    db_query = dict(parse_qsl(db_url.query))
+    db_query.setdefault("sslmode", "require")
+    DATABASE_URL = urlunsplit((
+        "postgresql+psycopg", db_url.netloc, db_url.path, urlencode(db_query), ""
+    ))
 
 app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_URL
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
+# No pre-ping: it costs a SELECT 1 on every checkout. TCP keepalives spot
+# dead peers instead, and a dropped connection is retried once (see ERRORS).
 app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
-    "pool_pre_ping": True,
-    "pool_recycle": 300,
+    # per worker process: keep WEB_CONCURRENCY * (POOL_SIZE + MAX_OVERFLOW)
+    # under Postgres max_connections
+    "pool_size": int(os.getenv("POOL_SIZE", "10")),
+    "max_overflow": int(os.getenv("MAX_OVERFLOW", "20")),
+    # fail fast with a 503 rather than queueing behind a saturated pool
+    "pool_timeout": 5,
+    # reuse the most recently returned connection so idle ones can expire
+    "pool_use_lifo": True,
+    "pool_recycle": 1800,
+    "pool_pre_ping": False,
 }
 
-db = SQLAlchemy(app)
+# libpq connection parameters; other drivers reject them as unknown keywords
+if db_url.scheme.startswith("postgres"):
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"]["connect_args"] = {
+        "connect_timeout": 5,
+        "keepalives": 1,
+        "keepalives_idle": 30,
+        # kill runaway queries server-side
+        "options": "-c statement_timeout=10000",
+    }
+
+# Sessions are request-scoped and nothing re-reads rows for freshness after
+# committing, so keep loaded attributes rather than re-SELECTing on access.
+db = SQLAlchemy(app, session_options={"expire_on_commit": False})
+
+# ================== QUERY LOGGING ==================
+SLOW_QUERY_SECONDS = float(os.getenv("SLOW_QUERY_MS", "100")) / 1000
+
+@event.listens_for(Engine, "before_cursor_execute")
+def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def log_slow_query(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    if elapsed > SLOW_QUERY_SECONDS:
+        app.logger.warning("Slow query (%.3fs): %s", elapsed, statement)
+
+# Lazy-load loops only show up once relationships exist; catch them in dev.
+# raiseload("*") turns any relationship that wasn't eagerly loaded into an
+# error, so every query has to say what it needs up front.
+if app.debug:
+    try:
+        from nplusone.ext.flask_sqlalchemy import NPlusOne
+        NPlusOne(app)
+    except ImportError:
+        app.logger.info("nplusone not installed, N+1 detection disabled")
+
+    @event.listens_for(OrmSession, "do_orm_execute")
+    def raise_on_lazy_load(state):
+        if state.is_select and not (state.is_column_load or state.is_relationship_load):
+            state.statement = state.statement.options(raiseload("*"))
+
+# Views hand templates plain rows or fully loaded objects, so the pooled
+# connection can go back before rendering rather than at teardown.
+@before_render_template.connect_via(app)
+def release_db_connection(sender, template, context, **extra):
+    db.session.close()
+
+# ================== CACHE ==================
+# Redis when available so every gunicorn worker shares one cache,
+# otherwise a per-process cache is still better than nothing.
+REDIS_URL = os.getenv("REDIS_URL")
+
+cache = Cache(app, config={
+    "CACHE_TYPE": "RedisCache" if REDIS_URL else "SimpleCache",
+    "CACHE_REDIS_URL": REDIS_URL,
+    "CACHE_KEY_PREFIX": "ebooklibrary:cache:",
+    "CACHE_DEFAULT_TIMEOUT": 60,
+})
+
+# Cached book pages are keyed on a version that every write bumps, so an
+# upload invalidates them with one SET instead of a SCAN + DEL over the
+# whole cache; orphaned entries just age out on their timeout.
+BOOK_CACHE_VERSION = "books/version"
+
+def book_cache_key():
+    return f"books/{cache.get(BOOK_CACHE_VERSION) or 0}{request.full_path}"
+
+def clear_book_cache():
+    cache.set(BOOK_CACHE_VERSION, time.time_ns(), timeout=0)
+    cache.delete_memoized(latest_books)
+    cache.delete_memoized(search_suggestions)
+    cache.delete_memoized(dashboard_stats)
+
+# ================== SESSIONS ==================
+# With Redis the cookie only carries a session id instead of the whole
+# signed session dict.
+if REDIS_URL:
+    app.config.update(
+        SESSION_TYPE="redis",
+        SESSION_REDIS=redis.from_url(REDIS_URL),
+        SESSION_KEY_PREFIX="ebooklibrary:session:",
+        SESSION_PERMANENT=False,
+        SESSION_USE_SIGNER=True,
+    )
+    Session(app)
+
+# ================== RATE LIMITS ==================
+# Every login attempt costs an argon2 verify; cap how much of that CPU one
+# client can burn. Counters live in Redis so all workers share them. The app
+# runs behind one proxy hop, so the client address comes from X-Forwarded-For.
+app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1)
+limiter = Limiter(get_remote_address, app=app, storage_uri=REDIS_URL or "memory://")
 
 # ================== CLOUDINARY ==================
 cloudinary.config(
@@ -52,6 +229,26 @@ cloudinary.config(
     api_secret=os.getenv("CLOUDINARY_API_SECRET")
 )
 
+# Cloudinary uploads take seconds, so they run on a small thread pool instead
+# of holding the admin's request (and a gunicorn worker) open.
+upload_executor = ThreadPoolExecutor(max_workers=4)
+# each publish_book() sends at most two files at once (cover + PDF)
+transfer_executor = ThreadPoolExecutor(max_workers=8)
+
+# ================== PASSWORDS ==================
+# argon2id tuned to the OWASP minimum; werkzeug's pbkdf2 default spends
+# 600k SHA-256 rounds of request-thread CPU on every login. Dev/test can
+# lower the cost via env. Existing hashes keep verifying and get rehashed
+# on the next login.
+password_hasher = PasswordHasher(
+    time_cost=int(os.getenv("ARGON2_TIME_COST", "2")),
+    memory_cost=int(os.getenv("ARGON2_MEMORY_KB", "19456")),
+    parallelism=1
+)
+
+def hash_password(password):
+    return password_hasher.hash(password)
+
 # ================== MODELS ==================
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -61,7 +258,31 @@ class User(db.Model):
     is_admin = db.Column(db.Boolean, default=False)
 
     def check_password(self, password_input):
-        return check_password_hash(self.password, password_input)
+        if not self.password.startswith("$argon2"):
+            # accounts created before the switch still hold werkzeug hashes
+            return check_password_hash(self.password, password_input)
+        try:
+            return password_hasher.verify(self.password, password_input)
+        except (VerificationError, InvalidHashError):
+            return False
+
+    def password_needs_rehash(self):
+        return (
+            not self.password.startswith("$argon2")
+            or password_hasher.check_needs_rehash(self.password)
+        )
+
+# SELECT EXISTS(...): stops at the first index hit and ships back one boolean
+def email_taken(email):
+    return db.session.scalar(db.select(db.exists().where(User.email == email)))
+
+PLACEHOLDER_COVER = "https://via.placeholder.com/300x450/6366f1/ffffff?text="
+
+def placeholder_cover(title):
+    return PLACEHOLDER_COVER + quote(title[:2].upper())
+
+def default_cover(context):
+    return placeholder_cover(context.get_current_parameters()["title"])
 
 class Book(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -70,10 +291,155 @@ class Book(db.Model):
     description = db.Column(db.Text)
     category = db.Column(db.String(100))
 
-    cover_url = db.Column(db.String(500))
+    # filled in on insert so list pages never have to build a fallback
+    cover_url = db.Column(db.String(500), nullable=False, default=default_cover)
     pdf_url = db.Column(db.String(500))
 
     views = db.Column(db.Integer, default=0)
+    created_at = db.Column(
+        db.DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+    # one copy of each book; also serves the duplicate checks on upload
+    __table_args__ = (
+        db.Index("idx_book_title_author", "title", "author", unique=True),
+    )
+
+# Books per category, kept current by a trigger on book (see SCHEMA_UPGRADES)
+# so the dashboard reads a handful of rows instead of grouping the table.
+book_category_count = db.Table(
+    "book_category_count",
+    db.Column("category", db.String(100), primary_key=True),
+    db.Column("n", db.Integer, nullable=False, default=0),
+)
+
+# pdf_url is only set once the background upload has finished; until then
+# a book is visible to admins but not listed or searchable.
+PUBLISHED = Book.pdf_url.is_not(None)
+
+# Book cards on the home, category and search pages only need these;
+# description can be several KB per row. Plain rows skip the identity map
+# and pickle small into the cache.
+def select_cards():
+    return db.select(
+        Book.id, Book.title, Book.author, Book.category, Book.cover_url
+    ).where(PUBLISHED)
+
+# ================== SEARCH INDEXES ==================
+# Full-text document for the search page; the query must use the exact same
+# expression as idx_book_search_weighted so Postgres can answer it from the
+# GIN index. Weights make ts_rank put title hits above description hits.
+SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(author, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(category, '')), 'C') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'D')"
+)
+
+# Title, author and category in one string for /api/search, so a suggestion
+# lookup is a single trigram GIN probe instead of a BitmapOr over three.
+SUGGEST_DOCUMENT = (
+    "(coalesce(title, '') || ' ' || coalesce(author, '') || ' ' || coalesce(category, ''))"
+)
+
+# Lowercased title for prefix autocomplete; text_pattern_ops lets a plain
+# B-tree answer LIKE 'prefix%' regardless of the database collation.
+TITLE_KEY = "lower(title)"
+
+# Normalised category used by /category/<name>; indexed as an expression.
+CATEGORY_KEY = "lower(replace(replace(category, '[', ''), ']', ''))"
+
+# Idempotent DDL (plus backfills) that db.create_all() won't apply to
+# existing tables. Indexes are built CONCURRENTLY so a deploy never blocks
+# writes to book; that needs autocommit, see init_db().
+# pg_trgm lets the planner serve ILIKE '%term%' from a GIN index.
+SCHEMA_UPGRADES = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_book_suggest_trgm ON book USING gin ({SUGGEST_DOCUMENT} gin_trgm_ops)",
+    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_book_title_prefix ON book (({TITLE_KEY}) text_pattern_ops)",
+    "DROP INDEX CONCURRENTLY IF EXISTS idx_book_title_trgm",
+    "DROP INDEX CONCURRENTLY IF EXISTS idx_book_author_trgm",
+    "DROP INDEX CONCURRENTLY IF EXISTS idx_book_category_trgm",
+    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_book_search_weighted ON book USING gin (({SEARCH_DOCUMENT}))",
+    "DROP INDEX CONCURRENTLY IF EXISTS idx_book_search",
+    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_book_category_key_id ON book (({CATEGORY_KEY}), id)",
+    "DROP INDEX CONCURRENTLY IF EXISTS idx_book_category_key",
+    # dashboard category counts come from book_category_count now
+    "DROP INDEX CONCURRENTLY IF EXISTS idx_book_category_id",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_book_author ON book (author)",
+    # Only while idx_book_title_author is missing (or left invalid by a
+    # failed build): keep the oldest copy of any duplicates and build the
+    # unique index with writes held off, so no duplicate can slip in between.
+    # Removed ids are reported (see init_db) since their Cloudinary files and
+    # view counts go with them.
+    """
+    DO $$
+    DECLARE
+        removed_count integer;
+        removed_ids text;
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = 'idx_book_title_author' AND i.indisvalid
+        ) THEN
+            LOCK TABLE book IN SHARE ROW EXCLUSIVE MODE;
+            DROP INDEX IF EXISTS idx_book_title_author;
+            WITH removed AS (
+                DELETE FROM book a USING book b
+                WHERE a.title = b.title AND a.author = b.author AND a.id > b.id
+                RETURNING a.id
+            )
+            SELECT count(*), string_agg(CAST(id AS text), ', ' ORDER BY id)
+            INTO removed_count, removed_ids FROM removed;
+            IF removed_count > 0 THEN
+                RAISE WARNING USING MESSAGE = 'Removed ' || removed_count
+                    || ' duplicate books (same title and author): ids ' || removed_ids;
+            END IF;
+            CREATE UNIQUE INDEX idx_book_title_author ON book (title, author);
+        END IF;
+    END
+    $$
+    """,
+    # NULL covers are backfilled first, see backfill_placeholder_covers()
+    "ALTER TABLE book ALTER COLUMN cover_url SET NOT NULL",
+    # now() is not volatile, so existing rows take the default without a rewrite
+    "ALTER TABLE book ADD COLUMN IF NOT EXISTS created_at timestamptz NOT NULL DEFAULT now()",
+    """
+    CREATE OR REPLACE FUNCTION book_category_count_bump() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE book_category_count SET n = n - 1
+            WHERE category = coalesce(OLD.category, 'uncategorized');
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            INSERT INTO book_category_count (category, n)
+            VALUES (coalesce(NEW.category, 'uncategorized'), 1)
+            ON CONFLICT (category) DO UPDATE SET n = book_category_count.n + 1;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    # first deploy only: backfill and attach the trigger in one transaction,
+    # with writes to book held off so no insert is counted twice or missed
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_trigger WHERE tgname = 'book_category_count_trg'
+        ) THEN
+            LOCK TABLE book IN SHARE ROW EXCLUSIVE MODE;
+            DELETE FROM book_category_count;
+            INSERT INTO book_category_count (category, n)
+            SELECT coalesce(category, 'uncategorized'), count(*) FROM book GROUP BY 1;
+            CREATE TRIGGER book_category_count_trg
+            AFTER INSERT OR DELETE OR UPDATE OF category ON book
+            FOR EACH ROW EXECUTE FUNCTION book_category_count_bump();
+        END IF;
+    END
+    $$
+    """,
+]
 
 # ================== DECORATORS ==================
 def login_required(f):
@@ -85,154 +451,571 @@ def login_required(f):
         return f(*args, **kwargs)
     return wrap
 
+ADMIN_RECHECK_SECONDS = 600
+
 def admin_required(f):
     @wraps(f)
     def wrap(*args, **kwargs):
         if "user_id" not in session:
             return redirect(url_for("login"))
-        try:
-            user = User.query.get(session["user_id"])
-        except OperationalError:
-            db.session.rollback()
-            return redirect(url_for("login"))
+        # is_admin is set at login; re-read it every few minutes so a revoked
+        # admin doesn't keep access for the life of the session
+        if time.time() - session.get("admin_checked_at", 0) > ADMIN_RECHECK_SECONDS:
+            session["is_admin"] = bool(
+                db.session.query(User.is_admin).filter_by(id=session["user_id"]).scalar()
+            )
+            session["admin_checked_at"] = time.time()
 
-        if not user or not user.is_admin:
+        if not session["is_admin"]:
             abort(403)
         return f(*args, **kwargs)
     return wrap
 
-# ================== INIT DB + ADMIN ==================
-with app.app_context():
-    db.session.execute(text("SELECT 1"))
-    db.create_all()
+# ================== BACKGROUND UPLOADS ==================
+UPLOAD_CHUNK_SIZE = 6_000_000
+# Cloudinary rejects single-request uploads above ~10MB
+LARGE_UPLOAD_BYTES = 10_000_000
+
+def upload_file(path, **options):
+    if os.path.getsize(path) > LARGE_UPLOAD_BYTES:
+        return cloudinary.uploader.upload_large(path, chunk_size=UPLOAD_CHUNK_SIZE, **options)
+    return cloudinary.uploader.upload(path, **options)
+
+# An unchosen or empty file would only fail later on Cloudinary, after the
+# book had been announced as uploading.
+def has_content(file_storage):
+    if not file_storage.filename:
+        return False
+    size = file_storage.stream.seek(0, os.SEEK_END)
+    file_storage.stream.seek(0)
+    return size > 0
+
+# Takes over the file the request already spooled; publish_book() removes it.
+def save_upload(file_storage):
+    stream = file_storage.stream
+    stream.close()
+    request.spooled_files.remove(stream.name)
+    return stream.name
+
+# spooled files nobody took over (rejected or duplicate uploads)
+@app.teardown_request
+def remove_spooled_files(exc):
+    for path in request.spooled_files:
+        if os.path.exists(path):
+            os.remove(path)
+
+# A derived cover is a nicety: if Cloudinary won't take the PDF as an image
+# (too large, encrypted...), the book keeps its placeholder.
+def first_page_cover(page_future):
+    try:
+        page = page_future.result()
+        return cloudinary.CloudinaryImage(page["public_id"]).build_url(
+            format="jpg", page=1, width=300, crop="fit", secure=True
+        )
+    except Exception:
+        app.logger.warning("Could not render a cover from the PDF", exc_info=True)
+        return None
+
+# images already uploaded for a book that is being dropped
+def discard_images(*futures):
+    for future in futures:
+        if future is None:
+            continue
+        try:
+            image = future.result()
+        except Exception:
+            continue  # never made it to Cloudinary
+        try:
+            cloudinary.uploader.destroy(image["public_id"], resource_type="image")
+        except Exception:
+            app.logger.warning("Could not delete image %s", image["public_id"], exc_info=True)
 
-    if ADMIN_EMAIL and ADMIN_PASSWORD:
-        admin = User.query.filter_by(email=ADMIN_EMAIL).first()
-        if not admin:
-            admin = User(
-                name="Admin",
-                email=ADMIN_EMAIL,
-                password=generate_password_hash(ADMIN_PASSWORD),
-                is_admin=True
+def publish_book(book_id, pdf_path, cover_path=None):
+    with app.app_context():
+        try:
+            # cover and PDF are independent requests, so send them together
+            cover_future = page_future = None
+            if cover_path:
+                cover_future = transfer_executor.submit(upload_file, cover_path)
+            elif os.path.getsize(pdf_path) <= LARGE_UPLOAD_BYTES:
+                # no cover given: send the PDF as an image too, so Cloudinary
+                # renders page 1 as the cover on its side (raw files can't
+                # be transformed). Larger PDFs are over its image size limit.
+                page_future = transfer_executor.submit(
+                    upload_file, pdf_path, resource_type="image"
+                )
+
+            # chunked upload keeps memory flat however big the PDF is
+            pdf_future = transfer_executor.submit(
+                cloudinary.uploader.upload_large,
+                pdf_path,
+                resource_type="raw",
+                chunk_size=UPLOAD_CHUNK_SIZE
             )
-            db.session.add(admin)
+
+            cover = cover_future.result() if cover_future else None
+            pdf = pdf_future.result()
+            page_cover = first_page_cover(page_future) if page_future else None
+
+            book = db.session.get(Book, book_id)
+            if book is None:
+                return
+
+            if cover:
+                book.cover_url = cover["secure_url"]
+            elif page_cover:
+                book.cover_url = page_cover
+            book.pdf_url = pdf["secure_url"]
+            db.session.commit()
+        except Exception:
+            app.logger.exception("Cloudinary upload failed for book %s", book_id)
+            discard_images(cover_future, page_future)
+            db.session.rollback()
+            Book.query.filter_by(id=book_id).delete()
             db.session.commit()
+        finally:
+            for path in (pdf_path, cover_path):
+                if path and os.path.exists(path):
+                    os.remove(path)
+            clear_book_cache()
+
+# ================== INIT DB + ADMIN ==================
+# Run once per deploy (Procfile release phase), not on every worker boot.
+# Rows from before cover_url was filled in on insert, and placeholders an
+# earlier SQL backfill built without URL-encoding the title, get exactly what
+# placeholder_cover() gives new rows.
+def backfill_placeholder_covers(conn):
+    book = Book.__table__
+    rows = conn.execute(
+        db.select(book.c.id, book.c.title, book.c.cover_url).where(
+            book.c.cover_url.is_(None)
+            | book.c.cover_url.startswith(PLACEHOLDER_COVER, autoescape=True)
+        )
+    ).all()
+    fixes = [
+        {"book_id": r.id, "cover": placeholder_cover(r.title)}
+        for r in rows if r.cover_url != placeholder_cover(r.title)
+    ]
+    if fixes:
+        conn.execute(
+            book.update()
+            .where(book.c.id == bindparam("book_id"))
+            .values(cover_url=bindparam("cover")),
+            fixes
+        )
+
+# RAISE WARNING from the upgrade blocks, e.g. rows a backfill removed
+def log_database_warning(diagnostic):
+    if diagnostic.severity_nonlocalized == "WARNING":
+        app.logger.warning(diagnostic.message_primary)
+
+def init_db():
+    db.create_all()
+
+    with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        driver_conn = conn.connection.driver_connection
+        driver_conn.add_notice_handler(log_database_warning)
+        try:
+            # index builds and backfills may legitimately outlast statement_timeout
+            conn.execute(text("SET statement_timeout = 0"))
+
+            # a failed CONCURRENTLY build leaves an invalid index behind that
+            # IF NOT EXISTS would skip forever; drop it so it is built again
+            invalid_indexes = conn.execute(text(
+                "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE i.indrelid = CAST('book' AS regclass) AND NOT i.indisvalid"
+            )).scalars().all()
+            for index_name in invalid_indexes:
+                app.logger.warning("Rebuilding invalid index %s", index_name)
+                conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{index_name}"'))
+
+            backfill_placeholder_covers(conn)
+            for statement in SCHEMA_UPGRADES:
+                conn.execute(text(statement))
+        finally:
+            driver_conn.remove_notice_handler(log_database_warning)
+            # back to the connect-time timeout before the pool hands it out
+            conn.execute(text("RESET statement_timeout"))
+
+def create_admin():
+    if not (ADMIN_EMAIL and ADMIN_PASSWORD):
+        return False
+
+    if email_taken(ADMIN_EMAIL):
+        return False
+
+    db.session.add(User(
+        name="Admin",
+        email=ADMIN_EMAIL,
+        password=hash_password(ADMIN_PASSWORD),
+        is_admin=True
+    ))
+    db.session.commit()
+    return True
+
+# Upload jobs run in the web process's executor, so a restart or deploy
+# drops any still queued and their rows would say "Uploading…" forever. The
+# cutoff leaves uploads still running on old workers during a release alone.
+PENDING_UPLOAD_TIMEOUT = timedelta(hours=1)
+
+def remove_stale_uploads():
+    cutoff = datetime.now(timezone.utc) - PENDING_UPLOAD_TIMEOUT
+    removed = db.session.execute(
+        db.delete(Book)
+        .where(Book.pdf_url.is_(None), Book.created_at < cutoff)
+        .returning(Book.id, Book.title)
+    ).all()
+    db.session.commit()
+
+    for book in removed:
+        app.logger.warning("Removed book %s (%s): its upload never finished", book.id, book.title)
+    return len(removed)
+
+@app.cli.command("init-db")
+def init_db_command():
+    init_db()
+    remove_stale_uploads()
+    print("Database ready")
+
+@app.cli.command("create-admin")
+def create_admin_command():
+    if create_admin():
+        print(f"Admin {ADMIN_EMAIL} created")
+    else:
+        print("Admin already exists or ADMIN_EMAIL/ADMIN_PASSWORD not set")
+
+# ================== VIEW COUNTS ==================
+# Popular books would otherwise take a row write (and row lock) on every
+# page view. Counts collect in a Redis hash and are written back in one
+# executemany UPDATE per minute.
+VIEW_COUNTS_KEY = "ebooklibrary:views"
+VIEW_FLUSH_SECONDS = 60
+# workers with counts taken out of VIEW_COUNTS_KEY but not yet written
+VIEW_FLUSHERS_KEY = f"{VIEW_COUNTS_KEY}:flushers"
+
+view_counter = redis.from_url(REDIS_URL) if REDIS_URL else None
+view_flusher = f"{socket.gethostname()}:{os.getpid()}"
+
+def flushing_key(flusher):
+    return f"{VIEW_COUNTS_KEY}:flushing:{flusher}"
+
+def flusher_alive_key(flusher):
+    return f"{VIEW_COUNTS_KEY}:alive:{flusher}"
+
+# Counts a dead worker took but never wrote (crash, deploy) are moved under
+# this worker's key; RENAMENX lets only one live worker adopt them.
+def adopt_orphaned_view_counts():
+    for flusher in view_counter.smembers(VIEW_FLUSHERS_KEY):
+        flusher = flusher.decode()
+        if view_counter.exists(flusher_alive_key(flusher)):
+            continue
+        try:
+            adopted = view_counter.renamenx(flushing_key(flusher), flushing_key(view_flusher))
+        except redis.ResponseError:
+            adopted = False  # already written, or adopted by another worker
+        view_counter.srem(VIEW_FLUSHERS_KEY, flusher)
+        if adopted:
+            app.logger.warning("Adopted unflushed view counts from %s", flusher)
+            return True
+    return False
+
+def flush_view_counts():
+    view_counter.set(flusher_alive_key(view_flusher), 1, ex=3 * VIEW_FLUSH_SECONDS)
+    key = flushing_key(view_flusher)
+
+    # a flush that failed last time keeps its hash and is retried first;
+    # otherwise take over a dead worker's counts, else the current ones.
+    # RENAME is atomic, so views recorded during the flush land in a fresh
+    # hash and no two workers ever flush the same counts.
+    if not view_counter.exists(key) and not adopt_orphaned_view_counts():
+        try:
+            view_counter.rename(VIEW_COUNTS_KEY, key)
+        except redis.ResponseError:
+            return  # nothing recorded since the last flush
+    view_counter.sadd(VIEW_FLUSHERS_KEY, view_flusher)
+
+    counts = view_counter.hgetall(key)
+    book = Book.__table__
+    with app.app_context():
+        db.session.execute(
+            book.update()
+            .where(book.c.id == bindparam("book_id"))
+            .values(views=func.coalesce(book.c.views, 0) + bindparam("count")),
+            [{"book_id": int(k), "count": int(v)} for k, v in counts.items()]
+        )
+        db.session.commit()
+    view_counter.delete(key)
+    view_counter.srem(VIEW_FLUSHERS_KEY, view_flusher)
+
+def flush_view_counts_forever():
+    while True:
+        time.sleep(VIEW_FLUSH_SECONDS)
+        try:
+            flush_view_counts()
+        except Exception:
+            app.logger.exception("Flushing view counts failed")
+
+if view_counter is not None:
+    threading.Thread(target=flush_view_counts_forever, daemon=True).start()
 
 # ================== PUBLIC ROUTES ==================
+BOOKS_PER_PAGE = 48
+
+# Keyset pagination: "after" is the last id of the previous page, so deep
+# pages cost the same as the first one (no OFFSET scan).
+# index.html greets the logged-in user, so cache the rows, not the page.
+@cache.memoize()
+def latest_books(after=None):
+    stmt = select_cards().order_by(Book.id.desc())
+    if after:
+        stmt = stmt.where(Book.id < after)
+    books = db.session.execute(stmt.limit(BOOKS_PER_PAGE + 1)).all()
+
+    next_after = books[BOOKS_PER_PAGE - 1].id if len(books) > BOOKS_PER_PAGE else None
+    return books[:BOOKS_PER_PAGE], next_after
+
 @app.route("/")
 def index():
-    books = Book.query.order_by(Book.id.desc()).all()
-    return render_template("index.html", books=books)
+    books, next_after = latest_books(request.args.get("after", type=int))
+
+    # the page shows the signed-in user's name, so keep it out of shared
+    # caches; the ETag still lets a browser's repeat visit come back as a 304
+    response = make_response(
+        render_template("index.html", books=books, next_after=next_after)
+    )
+    response.cache_control.private = True
+    response.add_etag()
+    return response.make_conditional(request)
 
+# no per-user content, so the rendered pages can be shared
 @app.route("/about")
+@cache.cached(timeout=3600)
 def about():
     return render_template("about.html")
 
 @app.route("/contact")
+@cache.cached(timeout=3600)
 def contact():
     return render_template("contact.html")
 
-@app.route('/book/<int:book_id>')
-def book_detail(book_id):
-    book = Book.query.get_or_404(book_id)
-
-    book.views += 1
+# With Redis, a view is an HINCRBY and the book row is only read; the
+# background flush folds the pending counts into Postgres. Without Redis,
+# one UPDATE ... RETURNING bumps the counter and fetches the row, instead of
+# SELECT + UPDATE (which could also lose concurrent increments).
+def record_view(book_id):
+    if view_counter is not None:
+        book = db.session.execute(
+            db.select(*Book.__table__.columns).where(Book.id == book_id)
+        ).first()
+        if book is None:
+            abort(404)
+        pending = view_counter.hincrby(VIEW_COUNTS_KEY, book_id, 1)
+        return dict(book._mapping, views=(book.views or 0) + pending)
+
+    book = db.session.execute(
+        db.update(Book)
+        .where(Book.id == book_id)
+        .values(views=func.coalesce(Book.views, 0) + 1)
+        .returning(*Book.__table__.columns)
+    ).first()
+    if book is None:
+        abort(404)
     db.session.commit()
+    return book
 
+@app.route('/book/<int:book_id>')
+def book_detail(book_id):
+    book = record_view(book_id)
     return render_template('book_detail.html', book=book)
 
 # ================== CATEGORY ==================
+# Same keyset paging as the home page, served by idx_book_category_key_id
+# (category key, id) so a page is one index range scan.
 @app.route("/category/<category_name>")
+@cache.cached(key_prefix=book_cache_key)
 def category_books(category_name):
     clean_category = category_name.strip().lower()
+    after = request.args.get("after", type=int)
 
-    books = Book.query.filter(
-        func.lower(
-            func.replace(
-                func.replace(Book.category, '[', ''),
-                ']', ''
-            )
-        ) == clean_category
-    ).all()
+    stmt = select_cards().where(
+        literal_column(CATEGORY_KEY) == clean_category
+    ).order_by(Book.id.desc())
+    if after:
+        stmt = stmt.where(Book.id < after)
+    books = db.session.execute(stmt.limit(BOOKS_PER_PAGE + 1)).all()
+
+    next_after = books[BOOKS_PER_PAGE - 1].id if len(books) > BOOKS_PER_PAGE else None
 
     return render_template(
         "categories.html",
-        books=books,
-        category=category_name
+        books=books[:BOOKS_PER_PAGE],
+        category=category_name,
+        next_after=next_after
     )
 
 # ================== SEARCH ==================
 @app.route("/search")
+@cache.cached(key_prefix=book_cache_key)
 def search():
     query = request.args.get("query", "").strip()
 
     if not query:
         return redirect(url_for("index"))
 
-    search = f"%{query}%"
-
-    books = Book.query.filter(
-        Book.title.ilike(search) |
-        Book.author.ilike(search) |
-        Book.category.ilike(search) |
-        Book.description.ilike(search)
-    ).order_by(Book.id.desc()).all()
+    # parenthesised: the weighted document is a chain of || operators
+    document = literal_column(f"({SEARCH_DOCUMENT})")
+    ts_query = func.websearch_to_tsquery("simple", query)
+
+    # ranked results can't be keyset-paged, but people rarely go past the
+    # first few pages, so OFFSET stays cheap here
+    page = max(request.args.get("page", 1, type=int), 1)
+
+    books = db.session.execute(
+        select_cards().where(
+            document.op("@@")(ts_query)
+        ).order_by(
+            func.ts_rank(document, ts_query).desc(),
+            Book.id.desc()
+        ).offset((page - 1) * BOOKS_PER_PAGE).limit(BOOKS_PER_PAGE + 1)
+    ).all()
 
     return render_template(
         "search_page.html",
-        books=books,
-        query=query
+        books=books[:BOOKS_PER_PAGE],
+        query=query,
+        page=page,
+        has_next=len(books) > BOOKS_PER_PAGE
     )
 
+SUGGESTION_LIMIT = 10
+
+# user input is matched literally, not as LIKE wildcards
+def escape_like(value):
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+# Memoized per query rather than caching the whole response, so every
+# request still gets its own ETag / 304 handling.
+@cache.memoize()
+def search_suggestions(query):
+    # What's being typed is usually the start of a title, which the B-tree
+    # prefix index answers with a short range scan; the trigram index only
+    # fills whatever slots are left with matches further inside the text.
+    term = escape_like(query)
+
+    # the autocomplete dropdown only shows title and author
+    suggestions = [dict(r) for r in db.session.execute(
+        db.select(Book.id, Book.title, Book.author).where(
+            literal_column(TITLE_KEY).like(f"{term}%", escape="\\"), PUBLISHED
+        ).order_by(literal_column(TITLE_KEY)).limit(SUGGESTION_LIMIT)
+    ).mappings()]
+
+    if len(suggestions) < SUGGESTION_LIMIT:
+        suggestions += [dict(r) for r in db.session.execute(
+            db.select(Book.id, Book.title, Book.author).where(
+                literal_column(SUGGEST_DOCUMENT).ilike(f"%{term}%", escape="\\"),
+                Book.id.not_in([b["id"] for b in suggestions]),
+                PUBLISHED
+            ).order_by(
+                # closest title/author matches first instead of newest first
+                func.greatest(
+                    func.similarity(Book.title, query),
+                    func.similarity(Book.author, query)
+                ).desc(),
+                Book.id.desc()
+            ).limit(SUGGESTION_LIMIT - len(suggestions))
+        ).mappings()]
+
+    return suggestions
+
 @app.route("/api/search")
 def api_search():
-    query = request.args.get("q", "").strip()
+    # ILIKE and similarity() both ignore case, so "War" and "war" can share
+    # one memoized result
+    query = request.args.get("q", "").strip().lower()
 
     if not query or len(query) < 2:
         return jsonify([])
 
-    search = f"%{query}%"
-
-    books = Book.query.filter(
-        Book.title.ilike(search) |
-        Book.author.ilike(search) |
-        Book.category.ilike(search)
-    ).order_by(Book.id.desc()).limit(10).all()
-
-    return jsonify([
-        {
-            "id": b.id,
-            "title": b.title,
-            "author": b.author,
-            "category": b.category,
-            "cover": b.cover_url,
-            "pdf": b.pdf_url
-        } for b in books
-    ])
+    response = jsonify(search_suggestions(query))
+    # suggestions are the same for everyone, so browsers and CDNs may reuse
+    # them briefly; after that repeats come back as an empty 304
+    response.cache_control.public = True
+    response.cache_control.max_age = 30
+    response.add_etag()
+    return response.make_conditional(request)
+
+@app.route("/api/books")
+def api_books():
+    books, next_after = latest_books(request.args.get("after", type=int))
+
+    response = jsonify({
+        "books": [
+            {
+                "id": b.id,
+                "title": b.title,
+                "author": b.author,
+                "category": b.category,
+                "cover": b.cover_url
+            } for b in books
+        ],
+        "next": next_after
+    })
+    # unchanged pages come back as an empty 304
+    response.add_etag()
+    return response.make_conditional(request)
+
+# Whole catalogue as NDJSON, one book per line, read in keyset batches. The
+# session is closed after each batch, so a slow client holds no pooled
+# connection or open transaction while it reads; memory stays flat however
+# many books there are. Public and uncached, so kept to a trickle per client.
+EXPORT_BATCH_SIZE = 500
+
+@app.route("/api/books/export")
+@limiter.limit("2 per minute")
+def api_books_export():
+    def generate():
+        after = None
+        while True:
+            stmt = select_cards().order_by(Book.id.desc()).limit(EXPORT_BATCH_SIZE)
+            if after:
+                stmt = stmt.where(Book.id < after)
+            rows = db.session.execute(stmt).all()
+            db.session.close()
+
+            for r in rows:
+                yield orjson.dumps({
+                    "id": r.id,
+                    "title": r.title,
+                    "author": r.author,
+                    "category": r.category,
+                    "cover": r.cover_url
+                }) + b"\n"
+
+            if len(rows) < EXPORT_BATCH_SIZE:
+                return
+            after = rows[-1].id
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
 
 # ================== READ ==================
 @app.route("/read/<int:book_id>")
 @login_required
 def read_book(book_id):
-    book = Book.query.get_or_404(book_id)
-
-    book.views += 1
-    db.session.commit()
-
+    book = record_view(book_id)
     return render_template("book_detail.html", book=book)
 
 # ================== AUTH ==================
 @app.route("/register", methods=["GET", "POST"])
 def register():
     if request.method == "POST":
-        if User.query.filter_by(email=request.form["email"]).first():
+        if email_taken(request.form["email"]):
             flash("Email already exists", "error")
             return redirect(url_for("register"))
 
         user = User(
             name=request.form["name"],
             email=request.form["email"],
-            password=generate_password_hash(request.form["password"])
+            password=hash_password(request.form["password"])
         )
         db.session.add(user)
         db.session.commit()
@@ -243,16 +1026,24 @@ def register():
     return render_template("register.html")
 
 @app.route("/login", methods=["GET", "POST"])
+@limiter.limit("10 per minute", methods=["POST"])
 def login():
     if request.method == "POST":
         email = request.form["email"]
         password = request.form["password"]
-        user = User.query.filter_by(email=email).first()
+        user = User.query.options(
+            load_only(User.id, User.name, User.password, User.is_admin)
+        ).filter_by(email=email).first()
 
         if user and user.check_password(password):
+            if user.password_needs_rehash():
+                user.password = hash_password(password)
+                db.session.commit()
+
             session["user_id"] = user.id
             session["user_name"] = user.name
             session["is_admin"] = user.is_admin
+            session["admin_checked_at"] = time.time()
             flash("Login successful!", "success")
             return redirect(url_for("index"))
 
@@ -277,7 +1068,7 @@ def forgot_password():
             flash('Email not found', 'error')
             return redirect(url_for('forgot_password'))
 
-        user.password = generate_password_hash(new_password)
+        user.password = hash_password(new_password)
         db.session.commit()
 
         flash('Password updated successfully', 'success')
@@ -292,66 +1083,168 @@ def logout():
     return redirect(url_for("index"))
 
 # ================== ADMIN ==================
+ADMIN_BOOKS_PER_PAGE = 50
+
+# Aggregates scan the whole table; cached briefly and dropped on every write
+# by clear_book_cache().
+@cache.memoize(30)
+def dashboard_stats():
+    total_authors = db.select(
+        func.count(func.distinct(Book.author))
+    ).correlate(None).scalar_subquery()
+
+    # one round trip: the trigger-maintained per-category counts with the
+    # author total riding along; the book total is their sum
+    rows = db.session.execute(
+        db.select(book_category_count.c.category, book_category_count.c.n, total_authors)
+        .where(book_category_count.c.n > 0)
+        .order_by(book_category_count.c.category)
+    ).all()
+
+    category_stats = [(cat, count) for cat, count, _ in rows]
+    total_books = sum(count for _, count in category_stats)
+    total_authors = rows[0][2] if rows else 0
+    return total_books, total_authors, category_stats
+
 @app.route("/admin")
 @admin_required
 def admin_dashboard():
-    total_books = Book.query.count()
-    total_authors = db.session.query(Book.author).distinct().count()
+    total_books, total_authors, category_stats = dashboard_stats()
 
-    category_stats = db.session.query(
-        func.coalesce(Book.category, "uncategorized"),
-        func.count(Book.id)
-    ).group_by(func.coalesce(Book.category, "uncategorized")).all()
+    # everything the dashboard renders, i.e. all but the description text
+    query = Book.query.options(
+        load_only(
+            Book.id, Book.title, Book.author, Book.category,
+            Book.cover_url, Book.pdf_url, Book.views
+        )
+    ).order_by(Book.id.desc())
 
-    books = Book.query.order_by(Book.id.desc()).all()
+    after = request.args.get("after", type=int)
+    if after:
+        query = query.filter(Book.id < after)
+    books = query.limit(ADMIN_BOOKS_PER_PAGE + 1).all()
+
+    next_after = books[ADMIN_BOOKS_PER_PAGE - 1].id if len(books) > ADMIN_BOOKS_PER_PAGE else None
 
     return render_template(
         "admin_dashboard.html",
         total_books=total_books,
         total_authors=total_authors,
         category_stats=category_stats,
-        books=books
+        books=books[:ADMIN_BOOKS_PER_PAGE],
+        next_after=next_after
     )
 
 # ================== ADMIN UPLOAD ==================
+# One INSERT ... ON CONFLICT DO NOTHING for any number of books: the unique
+# (title, author) index drops duplicates in the same statement, so there is
+# no SELECT first and no race between check and insert. Returns (id, title)
+# for the rows that went in.
+def insert_new_books(rows):
+    return db.session.execute(
+        pg_insert(Book).on_conflict_do_nothing(
+            index_elements=[Book.title, Book.author]
+        ).returning(Book.id, Book.title),
+        rows
+    ).all()
+
 @app.route("/admin/upload", methods=["GET", "POST"])
 @admin_required
 def upload_book():
     if request.method == "POST":
-        cover_url = None
+        pdf_file = request.files.get("pdf")
+        if not (pdf_file and has_content(pdf_file)):
+            flash("Select a PDF to upload", "error")
+            return redirect(url_for("upload_book"))
+
+        # pdf_url stays empty until the background upload fills it in
+        inserted = insert_new_books([{
+            "title": request.form["title"],
+            "author": request.form["author"],
+            "description": request.form.get("description", ""),
+            "category": request.form.get("category", "General")
+        }])
+        if not inserted:
+            flash("This book already exists", "error")
+            return redirect(url_for("upload_book"))
+
+        cover_path = None
 
         cover_file = request.files.get("cover")
         if cover_file and cover_file.filename != "":
-            cover = cloudinary.uploader.upload(cover_file)
-            cover_url = cover["secure_url"]
+            cover_path = save_upload(cover_file)
 
-        pdf = cloudinary.uploader.upload(
-            request.files["pdf"],
-            resource_type="raw"
-        )
+        pdf_path = save_upload(pdf_file)
 
-        book = Book(
-            title=request.form["title"],
-            author=request.form["author"],
-            description=request.form.get("description", ""),
-            category=request.form.get("category", "General"),
-            cover_url=cover_url,
-            pdf_url=pdf["secure_url"]
-        )
-        db.session.add(book)
         db.session.commit()
+        clear_book_cache()
+
+        upload_executor.submit(publish_book, inserted[0].id, pdf_path, cover_path)
 
-        flash("Book uploaded successfully", "success")
+        flash("Book saved, files are uploading in the background", "success")
         return redirect(url_for("admin_dashboard"))
 
     return render_template("upload.html")
 
+# ================== ADMIN BULK UPLOAD ==================
+@app.route("/admin/bulk-upload", methods=["GET", "POST"])
+@admin_required
+def bulk_upload():
+    if request.method == "POST":
+        pdf_files = [f for f in request.files.getlist("pdfs") if has_content(f)]
+        if not pdf_files:
+            flash("Select at least one PDF", "error")
+            return redirect(url_for("bulk_upload"))
+
+        author = request.form["author"]
+        category = request.form.get("category", "General")
+
+        rows = []
+        files_by_title = {}
+        for pdf_file in pdf_files:
+            title = os.path.splitext(pdf_file.filename)[0].replace("_", " ").strip()
+            if title in files_by_title:
+                continue
+            files_by_title[title] = pdf_file
+            rows.append({
+                "title": title,
+                "author": author,
+                "description": "",
+                "category": category
+            })
+
+        inserted = insert_new_books(rows)
+        skipped = len(pdf_files) - len(inserted)
+        if not inserted:
+            flash(f"All {skipped} books already exist", "error")
+            return redirect(url_for("bulk_upload"))
+
+        # only files for books that were actually inserted get spooled
+        pdf_paths = {
+            book.title: save_upload(files_by_title[book.title]) for book in inserted
+        }
+        db.session.commit()
+        clear_book_cache()
+
+        for book in inserted:
+            upload_executor.submit(publish_book, book.id, pdf_paths[book.title])
+
+        flash(
+            f"{len(inserted)} books saved ({skipped} duplicates skipped), "
+            "files are uploading in the background",
+            "success"
+        )
+        return redirect(url_for("admin_dashboard"))
+
+    return render_template("bulk_upload.html")
+
 @app.route("/admin/delete/<int:book_id>", methods=["POST"])
 @admin_required
 def delete_book(book_id):
     book = Book.query.get_or_404(book_id)
     db.session.delete(book)
     db.session.commit()
+    clear_book_cache()
     flash("Book deleted successfully", "success")
     return redirect(url_for("admin_dashboard"))
 
@@ -365,7 +1258,14 @@ def edit_book_pdf(book_id):
         book.title = request.form["title"]
         book.author = request.form["author"]
         book.category = request.form["category"]
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            flash("Another book already has this title and author", "error")
+            return redirect(url_for("admin_dashboard"))
+
+        clear_book_cache()
         flash("Book updated", "success")
         return redirect(url_for("admin_dashboard"))
 
@@ -391,7 +1291,14 @@ def update_book(book_id):
 
     book.category = clean_category
 
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        flash("Another book already has this title and author", "error")
+        return redirect(url_for("admin_dashboard"))
+
+    clear_book_cache()
     flash("Book updated successfully", "success")
     return redirect(url_for("admin_dashboard"))
 
@@ -404,6 +1311,35 @@ def forbidden(e):
 def not_found(e):
     return "<h1>404 - Page Not Found</h1>", 404
 
+@app.errorhandler(413)
+def too_large(e):
+    return "<h1>413 - File Too Large</h1>", 413
+
+@app.errorhandler(429)
+def too_many_requests(e):
+    return "<h1>429 - Too Many Requests</h1>", 429
+
+@app.errorhandler(OperationalError)
+def database_error(e):
+    db.session.rollback()
+    # the pool has already thrown away the dead connection, so a read can
+    # simply run again on a fresh one
+    if e.connection_invalidated and request.method == "GET" and not g.get("db_retried"):
+        g.db_retried = True
+        # errors raised here bypass the error handlers, so route them by hand
+        try:
+            return app.dispatch_request()
+        except OperationalError:
+            db.session.rollback()
+        except HTTPException as http_error:
+            return app.handle_http_exception(http_error)
+    return "<h1>503 - Database Unavailable</h1>", 503
+
+@app.errorhandler(PoolTimeoutError)
+def database_busy(e):
+    return "<h1>503 - Database Busy</h1>", 503
+
 # ================== RUN ==================
 if __name__ == "__main__":
-    app.run(debug=True, host="0.0.0.0", port=5000)
\ No newline at end of file
+    # local development only; production runs under gunicorn (gunicorn.conf.py)
+    app.run(debug=os.getenv("FLASK_DEBUG") == "1", host="0.0.0.0", port=5000)
\ No newline at end of file
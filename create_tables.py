@@ -1,5 +1,7 @@
-from app import app, db
+from app import app, init_db, create_admin, remove_stale_uploads
 
 with app.app_context():
-    db.create_all()
+    init_db()
+    remove_stale_uploads()
+    create_admin()
     print("create table successful!")
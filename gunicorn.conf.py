@@ -0,0 +1,9 @@
+import multiprocessing
+import os
+
+# Requests spend most of their time waiting on Postgres and Cloudinary, so
+# each worker runs several threads and those waits overlap.
+worker_class = "gthread"
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+timeout = 60
@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+# the views under test never reach the database; a file URL just lets the
+# engine accept the app's pool options
+os.environ.setdefault(
+    "DATABASE_URL",
+    "sqlite:///" + os.path.join(tempfile.gettempdir(), "ebooklibrary-test.db")
+)
+
+import app as ebooklibrary
+
+BOOKS = [
+    SimpleNamespace(
+        id=i, title=f"Book {i}", author="Author", category="general",
+        cover_url=f"https://covers.example/{i}.jpg"
+    )
+    for i in range(30, 0, -1)
+]
+
+
+class ConditionalGetTest(unittest.TestCase):
+    def setUp(self):
+        self.latest_books = ebooklibrary.latest_books
+        self.search_suggestions = ebooklibrary.search_suggestions
+        ebooklibrary.latest_books = lambda after=None: (BOOKS, None)
+        ebooklibrary.search_suggestions = lambda query: [
+            {"id": b.id, "title": b.title, "author": b.author} for b in BOOKS
+        ]
+        self.client = ebooklibrary.app.test_client()
+
+    def tearDown(self):
+        ebooklibrary.latest_books = self.latest_books
+        ebooklibrary.search_suggestions = self.search_suggestions
+
+    def assert_revalidates(self, path):
+        for encoding in ("", "gzip", "br", "gzip, deflate, br"):
+            with self.subTest(path=path, encoding=encoding):
+                headers = {"Accept-Encoding": encoding}
+                first = self.client.get(path, headers=headers)
+                self.assertEqual(first.status_code, 200)
+                self.assertIn("ETag", first.headers)
+
+                again = self.client.get(path, headers={
+                    **headers, "If-None-Match": first.headers["ETag"]
+                })
+                self.assertEqual(again.status_code, 304)
+                self.assertEqual(again.data, b"")
+
+    def test_api_books(self):
+        self.assert_revalidates("/api/books")
+
+    def test_api_search(self):
+        self.assert_revalidates("/api/search?q=book")
+
+    def test_index(self):
+        self.assert_revalidates("/")
+
+    def test_compressed_etag_differs_from_plain(self):
+        plain = self.client.get("/api/books", headers={"Accept-Encoding": ""})
+        brotli = self.client.get("/api/books", headers={"Accept-Encoding": "br"})
+        self.assertEqual(brotli.headers["Content-Encoding"], "br")
+        self.assertNotEqual(plain.headers["ETag"], brotli.headers["ETag"])
+
+
+if __name__ == "__main__":
+    unittest.main()
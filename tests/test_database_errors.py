@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+
+from flask import abort
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+os.environ.setdefault(
+    "DATABASE_URL",
+    "sqlite:///" + os.path.join(tempfile.gettempdir(), "ebooklibrary-test.db")
+)
+
+import app as ebooklibrary
+
+
+def dropped_connection():
+    return OperationalError(
+        "SELECT 1", {}, Exception("server closed the connection"),
+        connection_invalidated=True
+    )
+
+
+class DatabaseErrorTest(unittest.TestCase):
+    def setUp(self):
+        self.about = ebooklibrary.app.view_functions["about"]
+        self.calls = 0
+        self.client = ebooklibrary.app.test_client()
+
+    def tearDown(self):
+        ebooklibrary.app.view_functions["about"] = self.about
+
+    def serve(self, *outcomes):
+        def view():
+            outcome = outcomes[self.calls]
+            self.calls += 1
+            return outcome()
+        ebooklibrary.app.view_functions["about"] = view
+        return self.client.get("/about")
+
+    def raise_(self, error):
+        def outcome():
+            raise error
+        return outcome
+
+    def test_dropped_connection_is_retried_once(self):
+        response = self.serve(self.raise_(dropped_connection()), lambda: "ok")
+        self.assertEqual((response.status_code, response.data), (200, b"ok"))
+        self.assertEqual(self.calls, 2)
+
+    def test_failed_retry_is_503(self):
+        response = self.serve(
+            self.raise_(dropped_connection()), self.raise_(dropped_connection())
+        )
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(self.calls, 2)
+
+    def test_http_error_in_retry_uses_its_handler(self):
+        response = self.serve(
+            self.raise_(dropped_connection()), lambda: abort(404)
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertIn(b"Page Not Found", response.data)
+
+    def test_posts_are_not_retried(self):
+        ebooklibrary.app.view_functions["login"], login = (
+            self.raise_(dropped_connection()),
+            ebooklibrary.app.view_functions["login"],
+        )
+        try:
+            response = self.client.post("/login")
+        finally:
+            ebooklibrary.app.view_functions["login"] = login
+        self.assertEqual(response.status_code, 503)
+
+
+class NonPostgresUrlTest(unittest.TestCase):
+    def test_sqlite_url_connects(self):
+        # libpq-only connect_args would make this first connect fail
+        with ebooklibrary.app.app_context():
+            self.assertEqual(ebooklibrary.db.session.execute(text("SELECT 1")).scalar(), 1)
+            ebooklibrary.db.session.remove()
+            ebooklibrary.db.engine.dispose()
+
+
+if __name__ == "__main__":
+    unittest.main()